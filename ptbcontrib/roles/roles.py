@@ -25,6 +25,8 @@ from telegram import Bot, Update
 from telegram.ext.filters import UpdateFilter
 
 _REPLACED_LOCK: str = "ptbcontrib_roles_replaced_lock"
+# UpdateFilter keeps these in slots, so they are not part of Role.__dict__
+_FILTER_SLOTS: Dict[str, Any] = {"_name": None, "_data_filter": False}
 
 
 # We only inherit from UpdateFilter to get the nice syntax of the bitwise operators.
@@ -328,14 +330,17 @@ class Role(UpdateFilter):
             :obj:`bool`:
         """
         if self.chat_ids == other.chat_ids:
-            if len(self.child_roles) == len(other.child_roles):
-                if len(self.child_roles) == 0:
+            # child_roles copies the set under the lock on every access, so only do that once
+            child_roles = self.child_roles
+            other_child_roles = other.child_roles
+            if len(child_roles) == len(other_child_roles):
+                if len(child_roles) == 0:
                     return True
-                for child_role in self.child_roles:
-                    if not any(child_role.equals(ocr) for ocr in other.child_roles):
+                for child_role in child_roles:
+                    if not any(child_role.equals(ocr) for ocr in other_child_roles):
                         return False
-                for ocr in other.child_roles:
-                    if not any(ocr.equals(cr) for cr in self.child_roles):
+                for ocr in other_child_roles:
+                    if not any(ocr.equals(cr) for cr in child_roles):
                         return False
                 return True
         return False
@@ -358,25 +363,31 @@ class Role(UpdateFilter):
     def __getstate__(self) -> Dict[str, Any]:
         """
         Gets called, when object is being pickled. Sets all variables ending on ``_lock`` to
-        :obj:`None`.
+        :obj:`None` and adds the name and the ``data_filter`` flag, which are stored in slots of
+        :class:`telegram.ext.filters.UpdateFilter` and hence not part of ``__dict__``.
         Returns: The dictionary describing the current state of the object.
         """
         state = self.__dict__.copy()
         for key, value in state.items():
             if isinstance(value, type(Lock())):
                 state[key] = _REPLACED_LOCK
+        for key, default in _FILTER_SLOTS.items():
+            state[key] = getattr(self, key, default)
         return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
         """
         Gets called, when object is being un-pickled. Sets all variables ending on ``_lock`` to
-        a new :class:`threading.Lock` instance.
+        a new :class:`threading.Lock` instance and restores the name and the ``data_filter`` flag.
+        States pickled without these fall back to the defaults of :meth:`__init__`.
         Args:
             state: The pickled state of the object as produced by :meth:`__getstate__`.
         """
         for key, value in state.items():
             if isinstance(value, str) and value == _REPLACED_LOCK:
                 state[key] = Lock()
+        for key, default in _FILTER_SLOTS.items():
+            setattr(self, key, state.pop(key, default))
         self.__dict__.update(state)
 
         self.__init_admin()
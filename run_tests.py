@@ -18,12 +18,15 @@
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 """Helper script to run the test suites for ptbcontrib"""
 import itertools
+import os
 import subprocess  # nosec
 import sys
 from argparse import ArgumentParser
+from importlib.metadata import PackageNotFoundError, requires, version
 from pathlib import Path
 from typing import List
 
+from packaging.requirements import InvalidRequirement, Requirement
 from pygit2 import Repository
 
 root_path = Path(__file__).parent.resolve()
@@ -65,6 +68,75 @@ def get_changed_contrib_names() -> List[str]:
     return list(changed_contribs)
 
 
+def requirement_satisfied(requirement: Requirement) -> bool:
+    """Check whether a single requirement is installed in a matching version, including the
+    dependencies of any requested extras"""
+    if requirement.marker and not requirement.marker.evaluate():
+        return True
+    try:
+        installed_version = version(requirement.name)
+    except PackageNotFoundError:
+        return False
+    if not requirement.specifier.contains(installed_version, prereleases=True):
+        return False
+
+    for extra_requirement in map(Requirement, requires(requirement.name) or []):
+        # Dependencies without marker are installed along with the package itself
+        if extra_requirement.marker and any(
+            extra_requirement.marker.evaluate({"extra": extra}) for extra in requirement.extras
+        ):
+            extra_requirement.marker = None
+            if not requirement_satisfied(extra_requirement):
+                return False
+    return True
+
+
+def requirements_satisfied(requirements_file: Path) -> bool:
+    """Check whether all requirements listed in the file are already installed in a matching
+    version. Other requirement files included via ``-r`` are checked as well. Lines that can't
+    be checked are treated as not satisfied."""
+    with requirements_file.open(encoding="UTF-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("-r "):
+                included_file = requirements_file.parent / line[3:].strip()
+                if not requirements_satisfied(included_file):
+                    return False
+                continue
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                return False
+            if not requirement_satisfied(requirement):
+                return False
+    return True
+
+
+def install_requirements(requirements_file: Path) -> None:
+    """Install the requirements of a contribution, unless they are already satisfied or
+    installing is disabled via the ``PTBCONTRIB_SKIP_PIP_INSTALL`` environment variable"""
+    if os.getenv("PTBCONTRIB_SKIP_PIP_INSTALL", "").lower().strip() == "true":
+        return
+    if requirements_satisfied(requirements_file):
+        return
+
+    subprocess.check_call(  # nosec
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--disable-pip-version-check",
+            "--no-input",
+            "--quiet",
+            "-r",
+            str(requirements_file),
+        ]
+    )
+
+
 def run_tests(changed: bool, names: List[str]) -> int:
     """Run the required tests and install requirements for each one"""
     if changed:
@@ -75,16 +147,7 @@ def run_tests(changed: bool, names: List[str]) -> int:
     exit_code = 0
     for name in names:
         try:
-            subprocess.check_call(  # nosec
-                [
-                    sys.executable,
-                    "-m",
-                    "pip",
-                    "install",
-                    "-r",
-                    str(ptbcontrib_path / name / "requirements.txt"),
-                ]
-            )
+            install_requirements(ptbcontrib_path / name / "requirements.txt")
 
             result = subprocess.run(  # nosec
                 [sys.executable, "-m", "telegram"],
@@ -56,6 +56,20 @@ def env_var_2_bool(env_var: object) -> bool:
     return env_var.lower().strip() == "true"
 
 
+def seq_post(*responses):
+    """Builds a replacement for ``bot.request.post`` that returns the given responses in order.
+    Exceptions are raised instead of returned."""
+    responses_iter = iter(responses)
+
+    async def post(*args, **kwargs):
+        response = next(responses_iter)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    return post
+
+
 # This is here instead of in setup.cfg due to https://github.com/pytest-dev/pytest/issues/8343
 def pytest_runtestloop(session):
     # v13.x
@@ -21,120 +21,96 @@ from telegram import Message, MessageEntity
 
 from ptbcontrib import extract_urls
 
+# TelegramObjects are immutable, so the entities can be shared by all tests
+URL_ENTITIES = [
+    MessageEntity(length=6, offset=0, type="text_link", url="http://github.com"),
+    MessageEntity(length=17, offset=23, type="url"),
+    MessageEntity(length=14, offset=42, type="text_link", url="http://google.com"),
+]
+URL_TEXT = "Github can be found at http://github.com. Google is here."
+URL_RESULTS = ["http://github.com", "http://google.com"]
 
-class TestExtractURLs:
-    def test_extract_urls_entities(self):
-        test_entities = [
-            {"length": 6, "offset": 0, "type": "text_link", "url": "http://github.com"},
-            {"length": 17, "offset": 23, "type": "url"},
-            {"length": 14, "offset": 42, "type": "text_link", "url": "http://google.com"},
-        ]
-        test_text = "Github can be found at http://github.com. Google is here."
-        test_message = Message(
-            message_id=1,
-            from_user=None,
-            date=None,
-            chat=None,
-            text=test_text,
-            entities=[MessageEntity(**e) for e in test_entities],
-        )
-        results = extract_urls.extract_urls(test_message)
+ORDER_ENTITIES = [
+    MessageEntity(length=6, offset=0, type="text_link", url="http://github.com"),
+    MessageEntity(length=17, offset=27, type="text_link", url="http://google.com"),
+    MessageEntity(length=17, offset=55, type="url"),
+]
+ORDER_TEXT = "Github can not be found at http://google.com. It is at http://github.com."
+ORDER_RESULTS = ["http://github.com", "http://google.com"]
+
+PUBLIC_LINK = "https://t.me/group_name/123456"
+PRIVATE_LINK = "t.me/c/1173342352/256"
+MESSAGE_LINK_ENTITIES = [
+    MessageEntity(length=17, offset=0, type="url"),
+    MessageEntity(length=11, offset=18, type="text_link", url=PUBLIC_LINK),
+    MessageEntity(length=12, offset=30, type="text_link", url=PRIVATE_LINK),
+    MessageEntity(
+        length=11,
+        offset=43,
+        type="text_link",
+        url="https://t.me/joinchat/BHFkvxrbaIpgGsEJnO_pew",
+    ),
+    MessageEntity(
+        length=10, offset=55, type="text_link", url="https://t.me/pythontelegrambotgroup"
+    ),
+]
+MESSAGE_LINK_TEXT = "https://google.de public_link private_link invite_link group_link"
 
-        assert len(results) == 2
-        assert test_entities[0]["url"] == results[0]
-        assert test_entities[2]["url"] == results[1]
 
-    def test_extract_urls_caption(self):
-        test_entities = [
-            {"length": 6, "offset": 0, "type": "text_link", "url": "http://github.com"},
-            {"length": 17, "offset": 23, "type": "url"},
-            {"length": 14, "offset": 42, "type": "text_link", "url": "http://google.com"},
-        ]
-        caption = "Github can be found at http://github.com. Google is here."
-        test_message = Message(
+def make_message(text, entities, caption=False):
+    if caption:
+        return Message(
             message_id=1,
             from_user=None,
             date=None,
             chat=None,
-            caption=caption,
-            caption_entities=[MessageEntity(**e) for e in test_entities],
+            caption=text,
+            caption_entities=entities,
         )
-        results = extract_urls.extract_urls(test_message)
+    return Message(
+        message_id=1,
+        from_user=None,
+        date=None,
+        chat=None,
+        text=text,
+        entities=entities,
+    )
 
-        assert len(results) == 2
-        assert test_entities[0]["url"] == results[0]
-        assert test_entities[2]["url"] == results[1]
 
-    def test_extract_urls_order(self):
-        test_entities = [
-            {"length": 6, "offset": 0, "type": "text_link", "url": "http://github.com"},
-            {"length": 17, "offset": 27, "type": "text_link", "url": "http://google.com"},
-            {"length": 17, "offset": 55, "type": "url"},
-        ]
-        test_text = "Github can not be found at http://google.com. It is at http://github.com."
-        test_message = Message(
-            message_id=1,
-            from_user=None,
-            date=None,
-            chat=None,
-            text=test_text,
-            entities=[MessageEntity(**e) for e in test_entities],
-        )
-        results = extract_urls.extract_urls(test_message)
+# The message is never modified by the tests, so we only build it once
+@pytest.fixture(scope="module")
+def message_link_message():
+    return make_message(MESSAGE_LINK_TEXT, MESSAGE_LINK_ENTITIES)
 
-        assert len(results) == 2
-        assert test_entities[0]["url"] == results[0]
-        assert test_entities[1]["url"] == results[1]
 
-    def test_extract_message_links(self):
-        test_entities = [
-            {
-                "length": 17,
-                "offset": 0,
-                "type": "url",
-            },
-            {
-                "length": 11,
-                "offset": 18,
-                "type": "text_link",
-                "url": "https://t.me/group_name/123456",
-            },
-            {"length": 12, "offset": 30, "type": "text_link", "url": "t.me/c/1173342352/256"},
-            {
-                "length": 11,
-                "offset": 43,
-                "type": "text_link",
-                "url": "https://t.me/joinchat/BHFkvxrbaIpgGsEJnO_pew",
-            },
-            {
-                "length": 10,
-                "offset": 55,
-                "type": "text_link",
-                "url": "https://t.me/pythontelegrambotgroup",
-            },
-        ]
-        test_text = "https://google.de public_link private_link invite_link group_link"
-        test_message = Message(
-            message_id=1,
-            from_user=None,
-            date=None,
-            chat=None,
-            text=test_text,
-            entities=[MessageEntity(**e) for e in test_entities],
-        )
+class TestExtractURLs:
+    @pytest.mark.parametrize(
+        "text, entities, caption, expected",
+        [
+            (URL_TEXT, URL_ENTITIES, False, URL_RESULTS),
+            (URL_TEXT, URL_ENTITIES, True, URL_RESULTS),
+            (ORDER_TEXT, ORDER_ENTITIES, False, ORDER_RESULTS),
+        ],
+        ids=["entities", "caption", "order"],
+    )
+    def test_extract_urls(self, text, entities, caption, expected):
+        results = extract_urls.extract_urls(make_message(text, entities, caption=caption))
+
+        assert results == expected
 
-        results = extract_urls.extract_message_links(test_message)
+    def test_extract_message_links(self, message_link_message):
+        results = extract_urls.extract_message_links(message_link_message)
         assert len(results) == 2
-        assert results[0] == test_entities[1]["url"]
-        assert results[1] == test_entities[2]["url"]
+        assert results[0] == PUBLIC_LINK
+        assert results[1] == PRIVATE_LINK
 
-        results = extract_urls.extract_message_links(test_message, private_only=True)
+        results = extract_urls.extract_message_links(message_link_message, private_only=True)
         assert len(results) == 1
-        assert results[0] == test_entities[2]["url"]
+        assert results[0] == PRIVATE_LINK
 
-        results = extract_urls.extract_message_links(test_message, public_only=True)
+        results = extract_urls.extract_message_links(message_link_message, public_only=True)
         assert len(results) == 1
-        assert results[0] == test_entities[1]["url"]
+        assert results[0] == PUBLIC_LINK
 
     def test_extract_message_links_value_error(self):
         with pytest.raises(ValueError):
@@ -22,7 +22,7 @@ from telegram.error import BadRequest
 
 from ptbcontrib.get_chat_link import get_chat_link
 
-from .conftest import make_bot
+from .conftest import make_bot, seq_post
 
 
 @pytest.fixture(scope="module")
@@ -33,8 +33,8 @@ def bot_factory():
     bot._post = post
 
 
-@pytest.fixture(scope="function")
-def chat(bot_factory):
+@pytest.fixture(scope="module")
+def _chat(bot_factory):
     chat = Chat(1, type="channel", title="test channel")
     chat.set_bot(bot_factory)
     chat._unfreeze()
@@ -42,7 +42,15 @@ def chat(bot_factory):
 
 
 @pytest.fixture(scope="function")
-def bot_chat_dict():
+def chat(_chat):
+    # The chat is shared across the module, so undo the changes the tests make to it
+    yield _chat
+    _chat.username = None
+    _chat.invite_link = None
+
+
+@pytest.fixture(scope="module")
+def _bot_chat_dict():
     return {
         "id": 1,
         "type": "channel",
@@ -50,7 +58,18 @@ def bot_chat_dict():
     }
 
 
+@pytest.fixture(scope="function")
+def bot_chat_dict(_bot_chat_dict):
+    yield _bot_chat_dict
+    _bot_chat_dict.pop("invite_link", None)
+
+
 class TestChatToLink:
+    invite_link = "https://t.me/joinchat/RQ4-ELmRIl82ZDZk"
+    exported_invite_link = "https://t.me/joinchat/m4Zho4YdtexiMzI0"
+    permission_error_message = "Not enough rights to manage chat invite link"
+    other_error_message = "Some other error"
+
     async def test_chat_username(self, chat):
         username = "test_username"
         chat.username = username
@@ -60,68 +79,47 @@ class TestChatToLink:
         assert link == f"https://t.me/{username}"
 
     async def test_chat_invite_link(self, chat):
-        invite_link = "https://t.me/joinchat/RQ4-ELmRIl82ZDZk"
-        chat.invite_link = invite_link
+        chat.invite_link = self.invite_link
 
         link = await get_chat_link(chat)
 
-        assert link == invite_link
+        assert link == self.invite_link
 
     async def test_bot_chat_invite_link(self, chat, bot_chat_dict, monkeypatch):
-        invite_link = "https://t.me/joinchat/RQ4-ELmRIl82ZDZk"
-        res = bot_chat_dict
-        res["invite_link"] = invite_link
-
-        async def post(*args, **kwargs):
-            return bot_chat_dict
+        bot_chat_dict["invite_link"] = self.invite_link
 
-        monkeypatch.setattr(chat.get_bot().request, "post", post)
+        monkeypatch.setattr(chat.get_bot().request, "post", seq_post(bot_chat_dict))
 
         link = await get_chat_link(chat)
 
-        assert link == invite_link
+        assert link == self.invite_link
 
     async def test_export_chat_invite_link(self, chat, bot_chat_dict, monkeypatch):
-        invite_link = "https://t.me/joinchat/m4Zho4YdtexiMzI0"
-        call = [0]
-
-        async def post(*args, **kwargs):
-            if call[0] == 0:
-                call[0] += 1
-                return bot_chat_dict
-            return invite_link
-
-        monkeypatch.setattr(chat.get_bot().request, "post", post)
+        monkeypatch.setattr(
+            chat.get_bot().request, "post", seq_post(bot_chat_dict, self.exported_invite_link)
+        )
 
         link = await get_chat_link(chat)
 
-        assert link == invite_link
+        assert link == self.exported_invite_link
 
     async def test_bot_permission_error(self, chat, bot_chat_dict, monkeypatch):
-        call = [0]
-
-        async def post(*args, **kwargs):
-            if call[0] == 0:
-                call[0] += 1
-                return bot_chat_dict
-            raise BadRequest("Not enough rights to manage chat invite link")
-
-        monkeypatch.setattr(chat.get_bot().request, "post", post)
+        monkeypatch.setattr(
+            chat.get_bot().request,
+            "post",
+            seq_post(bot_chat_dict, BadRequest(self.permission_error_message)),
+        )
 
         link = await get_chat_link(chat)
 
         assert link is None
 
     async def test_bot_other_error(self, chat, bot_chat_dict, monkeypatch):
-        call = [0]
-
-        async def post(*args, **kwargs):
-            if call[0] == 0:
-                call[0] += 1
-                return bot_chat_dict
-            raise BadRequest("Some other error")
-
-        monkeypatch.setattr(chat.get_bot().request, "post", post)
+        monkeypatch.setattr(
+            chat.get_bot().request,
+            "post",
+            seq_post(bot_chat_dict, BadRequest(self.other_error_message)),
+        )
 
         with pytest.raises(BadRequest):
             await get_chat_link(chat)
@@ -1,21 +1,32 @@
 import logging
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 from telegram.constants import ParseMode
 
 from ptbcontrib.log_forwarder import LogForwarder
 
+LOG_MESSAGE = "TEST"
+# The message as wrapped in a code block by LogForwarder.format_tg_msg
+EXPECTED_TEXT = f"```\n{LOG_MESSAGE}\n```"
+
 
 async def test_log_forwarder():
     root_logger = logging.getLogger()
     chat_ids = [69420]
-    bot = MagicMock()
+    calls = []
+    bot = SimpleNamespace(send_message=lambda **kwargs: calls.append(kwargs))
     log_forwarder = LogForwarder(bot, chat_ids)
     root_logger.addHandler(log_forwarder)
 
-    logger = logging.getLogger("test_logger")
-    logger.error("TEST")
+    try:
+        logger = logging.getLogger("test_logger")
+        logger.error(LOG_MESSAGE)
+    finally:
+        # Don't leave the forwarder attached to the root logger for the following tests
+        root_logger.removeHandler(log_forwarder)
 
-    bot.send_message.assert_called_with(
-        chat_id=69420, text="```\nTEST\n```", parse_mode=ParseMode.MARKDOWN_V2
-    )
+    assert calls[-1] == {
+        "chat_id": 69420,
+        "text": EXPECTED_TEXT,
+        "parse_mode": ParseMode.MARKDOWN_V2,
+    }
@@ -17,14 +17,17 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 import os
+import subprocess  # nosec
+import sys
 
 import pytest
 
 from tests.conftest import env_var_2_bool
 
+TEST_BUILD = env_var_2_bool(os.getenv("TEST_BUILD", False))
 
-@pytest.mark.skipif(
-    not env_var_2_bool(os.getenv("TEST_BUILD", False)), reason="TEST_BUILD not enabled"
-)
+
+@pytest.mark.skipif(not TEST_BUILD, reason="TEST_BUILD not enabled")
 def test_build():
-    assert os.system("python setup.py bdist_dumb") == 0  # pragma: no cover
+    result = subprocess.run([sys.executable, "setup.py", "bdist_dumb"], check=False)  # nosec
+    assert result.returncode == 0  # pragma: no cover
@@ -17,21 +17,35 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 import pytest
+
+pytest.importorskip("sqlalchemy")
+
 from sqlalchemy.orm import scoped_session  # noqa: E402
-from telegram import Chat, Message, Update, User
-from telegram.ext import Application, MessageHandler
+from telegram import Chat, Message, Update, User  # noqa: E402
+from telegram.ext import Application, MessageHandler  # noqa: E402
 
 from ptbcontrib.postgres_persistence import PostgresPersistence  # noqa: E402
-from tests.conftest import DictExtBot
+from tests.conftest import DictExtBot  # noqa: E402
 
 
-@pytest.fixture(scope="function")
+# The update is only read by the tests, so we only build it once
+@pytest.fixture(scope="module")
 def update():
     return Update(
         1, message=Message(1, None, Chat(1, ""), from_user=User(1, "", False), text="Text")
     )
 
 
+@pytest.fixture(scope="module")
+def build_app(bot):
+    dict_bot = DictExtBot(bot.token)
+
+    def build(persistence):
+        return Application.builder().bot(dict_bot).persistence(persistence).build()
+
+    return build
+
+
 # as __load_database() method calls .first()
 # over session.execute() results.
 class FakeExecResult:
@@ -39,6 +53,28 @@ class FakeExecResult:
         return None
 
 
+# The result has no state, so every execute call can return the same instance
+FAKE_EXEC_RESULT = FakeExecResult()
+
+
+class FakeScopedSession(scoped_session):
+    """Records the calls made by PostgresPersistence on the test instead of using a database.
+    Passes the type check of PostgresPersistence without setting up a session registry."""
+
+    def __init__(self, recorder):
+        self._recorder = recorder
+
+    def execute(self, query, *args, **kwargs):
+        self._recorder.executed = query
+        return FAKE_EXEC_RESULT
+
+    def commit(self):
+        self._recorder.commited = 555
+
+    def close(self):
+        self._recorder.ses_closed = True
+
+
 class TestPostgresPersistence:
     executed = ""
     commited = 0
@@ -55,15 +91,9 @@ class TestPostgresPersistence:
         self.ses_closed = False
         self.flush_flag = False
 
-    def mocked_execute(self, query, *args, **kwargs):
-        self.executed = query
-        return FakeExecResult()
-
-    def mock_commit(self):
-        self.commited = 555
-
-    def mock_ses_close(self):
-        self.ses_closed = True
+    @pytest.fixture(scope="function")
+    def session(self):
+        return FakeScopedSession(self)
 
     def test_no_args(self):
         with pytest.raises(TypeError, match="provide either url or session."):
@@ -77,18 +107,18 @@ class TestPostgresPersistence:
         with pytest.raises(TypeError, match="isn't a valid PostgreSQL"):
             PostgresPersistence(url="sqlite:///owo.db")
 
-    async def test_with_handler(self, bot, update, monkeypatch):
-        session = scoped_session("a")
-        monkeypatch.setattr(session, "execute", self.mocked_execute)
-        monkeypatch.setattr(session, "commit", self.mock_commit)
-        monkeypatch.setattr(session, "close", self.mock_ses_close)
+    @pytest.mark.parametrize(["on_flush", "expected"], [(False, True), (True, False)])
+    async def test_with_handler(self, build_app, update, session, monkeypatch, on_flush, expected):
+        persistence = PostgresPersistence(session=session, on_flush=on_flush)
+        update_database = persistence._update_database
 
-        app = (
-            Application.builder()
-            .bot(DictExtBot(bot.token))
-            .persistence(PostgresPersistence(session=session))
-            .build()
-        )
+        def recording_update_database():
+            # Still run the real write, so that the queries reach the session
+            self.flush_flag = True
+            update_database()
+
+        monkeypatch.setattr(persistence, "_update_database", recording_update_database)
+        app = build_app(persistence)
 
         async def first(update, context):
             if not context.user_data == {}:
@@ -119,58 +149,19 @@ class TestPostgresPersistence:
             app.add_handler(h2)
             await app.process_update(update)
 
-        assert self.executed != ""
-        assert self.commited == 555
-        assert self.ses_closed is True
-
-    @pytest.mark.parametrize(["on_flush", "expected"], [(False, True)])
-    async def test_on_flush(self, bot, update, monkeypatch, on_flush, expected):
-        session = scoped_session("a")
-        monkeypatch.setattr(session, "execute", self.mocked_execute)
-        monkeypatch.setattr(session, "commit", self.mock_commit)
-        monkeypatch.setattr(session, "close", self.mock_ses_close)
-
-        persistence = PostgresPersistence(session=session, on_flush=on_flush)
-
-        def mocked_update_database():
-            self.flush_flag = True
-
-        monkeypatch.setattr(persistence, "_update_database", mocked_update_database)
-        app = Application.builder().bot(DictExtBot(bot.token)).persistence(persistence).build()
-
-        async def first(update, context):
-            context.user_data["test1"] = "test2"
-            context.chat_data[3] = "test4"
-            context.bot_data["test1"] = "test2"
-
-        async def second(update, context):
-            if not context.user_data["test1"] == "test2":
-                pytest.fail()
-            if not context.chat_data[3] == "test4":
-                pytest.fail()
-            if not context.bot_data["test1"] == "test2":
-                pytest.fail()
-
-        h1 = MessageHandler(None, first)
-        h2 = MessageHandler(None, second)
-
-        async with app:
-            app.add_handler(h1)
-            await app.process_update(update)
-
-            app.remove_handler(h1)
-            app.add_handler(h2)
-            await app.process_update(update)
-
             await app.update_persistence()
+            # Without on_flush, every update of the data is written to the database right away
             assert self.flush_flag is expected
+            if expected:
+                assert self.executed.text == "UPDATE persistence SET data = :jsondata"
 
-    def test_load_on_boot(self, monkeypatch):
-        session = scoped_session("a")
-        monkeypatch.setattr(session, "execute", self.mocked_execute)
-        monkeypatch.setattr(session, "commit", self.mock_commit)
-        monkeypatch.setattr(session, "close", self.mock_ses_close)
+        # Shutting down the application flushes the persistence in either case
+        assert self.flush_flag is True
+        assert self.executed.text == "UPDATE persistence SET data = :jsondata"
+        assert self.commited == 555
+        assert self.ses_closed is True
 
+    def test_load_on_boot(self, session):
         PostgresPersistence(session=session)
         assert self.executed.text in {
             "SELECT data FROM persistence",
@@ -179,12 +170,7 @@ class TestPostgresPersistence:
         assert self.commited == 555
         assert self.ses_closed is True
 
-    async def test_flush(self, bot, update, monkeypatch):
-        session = scoped_session("a")
-        monkeypatch.setattr(session, "execute", self.mocked_execute)
-        monkeypatch.setattr(session, "commit", self.mock_commit)
-        monkeypatch.setattr(session, "close", self.mock_ses_close)
-
+    async def test_flush(self, session):
         await PostgresPersistence(session=session).flush()
         assert self.executed != ""
         assert self.commited == 555
@@ -21,32 +21,48 @@ import logging
 import os
 import platform
 
-import apscheduler.triggers.interval
 import pytest
-from telegram.ext import ApplicationBuilder, CallbackContext, JobQueue
+
+pytest.importorskip("apscheduler")
+pytest.importorskip("pymongo")
+pytest.importorskip("sqlalchemy")
+
+import apscheduler.triggers.interval  # noqa: E402
+from telegram.ext import ApplicationBuilder, CallbackContext, JobQueue  # noqa: E402
 
 from ptbcontrib.ptb_jobstores.mongodb import PTBMongoDBJobStore  # noqa: E402
 from ptbcontrib.ptb_jobstores.sqlalchemy import PTBSQLAlchemyJobStore  # noqa: E402
 
-job_queue_params = [(PTBSQLAlchemyJobStore, {"url": "sqlite:///:memory:"})]
+GITHUB_ACTIONS = os.getenv("GITHUB_ACTIONS", False)
+
+# The URL of the SQLite database is set by the `jq` fixture, as it lives in a temporary directory
+job_queue_params = [(PTBSQLAlchemyJobStore, {})]
 job_queue_param_ids = ["SQLAlchemyJobStore"]
 
-if os.getenv("GITHUB_ACTIONS", False):
+if GITHUB_ACTIONS:
     # Currently only tested by using the GitHub Action supercharge/mongodb-github-action@1.8.0
     # which provides a MongoDB instance
     job_queue_params.append((PTBMongoDBJobStore, {"host": "localhost"}))
     job_queue_param_ids.append("MongoDBJobStore")
 
 
+# Setting up the job store is by far the most expensive part of these tests, so we only do it
+# once per class and clean up the jobs after each test instead (see the `jobstore` fixture)
 @pytest.fixture(
-    scope="function",
+    scope="class",
     params=job_queue_params,
     ids=job_queue_param_ids,
 )
-async def jq(request, bot):
+async def jq(request, bot, tmp_path_factory):
     jq = JobQueue()
     app = ApplicationBuilder().bot(bot).job_queue(jq).build()
-    job_store = request.param[0](application=app, **request.param[1])
+    kwargs = dict(request.param[1])
+    if request.param[0] is PTBSQLAlchemyJobStore:
+        # Unlike an in-memory database, a file is shared by all connections, including the ones
+        # of the scheduler threads, and the schema only has to be created once
+        db_path = tmp_path_factory.mktemp("ptb_jobstores") / "jobs.sqlite"
+        kwargs["url"] = f"sqlite:///{db_path}"
+    job_store = request.param[0](application=app, **kwargs)
     jq.scheduler.add_jobstore(job_store)
     await jq.start()
     yield jq
@@ -57,7 +73,9 @@ async def jq(request, bot):
 
 @pytest.fixture(scope="function")
 def jobstore(jq):
-    return jq.scheduler._jobstores["default"]
+    job_store = jq.scheduler._jobstores["default"]
+    yield job_store
+    job_store.remove_all_jobs()
 
 
 def dummy_job(ctx):
@@ -68,7 +86,7 @@ def dummy_job(ctx):
 
 
 @pytest.mark.skipif(
-    os.getenv("GITHUB_ACTIONS", False) and platform.system() in ["Windows", "Darwin"],
+    GITHUB_ACTIONS and platform.system() in ["Windows", "Darwin"],
     reason="On Windows & MacOS precise timings are not accurate.",
 )
 class TestPTBJobstore:
@@ -76,10 +94,13 @@ class TestPTBJobstore:
         assert type(jobstore) in (PTBMongoDBJobStore, PTBSQLAlchemyJobStore)
 
     def test_next_runtime(self, jq, jobstore):
-        jq.run_repeating(dummy_job, 10, first=0.1)
-        assert jobstore.get_next_run_time().second == pytest.approx(
-            dtm.datetime.now().second + 10, 1
-        )
+        before = dtm.datetime.now(dtm.timezone.utc)
+        # The job queue is already running, so schedule the first run far enough ahead that it
+        # can't fire before we look it up
+        jq.run_repeating(dummy_job, 10, first=10)
+        # Compare the full timestamps, comparing only the seconds breaks at minute boundaries
+        delta = (jobstore.get_next_run_time() - before).total_seconds()
+        assert delta == pytest.approx(10, abs=1)
 
     def test_lookup_job(self, jq, jobstore):
         initial_job = jq.run_once(dummy_job, 1)
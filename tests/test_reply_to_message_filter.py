@@ -24,21 +24,27 @@ from telegram.ext import filters
 
 from ptbcontrib.reply_to_message_filter import ReplyToMessageFilter
 
+# The tests never look at the date, so there is no need to query the clock
+MESSAGE_DATE = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+REGEX_FILTER = filters.Regex(r"(\d+)")
+REPLY_REGEX_FILTER = ReplyToMessageFilter(REGEX_FILTER)
+TEXT_NOT_REPLY_TEXT_FILTER = filters.TEXT & ~ReplyToMessageFilter(filters.TEXT)
 
-@pytest.fixture(scope="function")
-def update():
+
+@pytest.fixture(scope="module")
+def _update():
     update = Update(
         0,
         Message(
             0,
-            datetime.datetime.utcnow(),
+            MESSAGE_DATE,
             Chat(0, "private"),
             from_user=User(0, "Testuser", False),
             via_bot=User(0, "Testbot", True),
             sender_chat=Chat(0, "Channel"),
             reply_to_message=Message(
                 0,
-                datetime.datetime.utcnow(),
+                MESSAGE_DATE,
                 Chat(0, "private"),
                 from_user=User(0, "Testuser", False),
                 via_bot=User(0, "Testbot", True),
@@ -52,6 +58,19 @@ def update():
     return update
 
 
+@pytest.fixture(scope="function")
+def update(_update):
+    # The update is shared across the module, so undo the changes the tests make to it
+    message = _update.message
+    reply_to_message = message.reply_to_message
+    yield _update
+    _update.message = message
+    _update.channel_post = None
+    message.text = None
+    message.reply_to_message = reply_to_message
+    reply_to_message.text = None
+
+
 class TestReplyToMessageFilter:
     def test_basic(self, update):
         update.message.reply_to_message.text = "test"
@@ -63,15 +82,15 @@ class TestReplyToMessageFilter:
         assert not ReplyToMessageFilter(filters.ALL).check_update(update)
 
     def test_combination(self, update):
-        assert not (filters.TEXT & ~ReplyToMessageFilter(filters.TEXT)).check_update(update)
+        assert not TEXT_NOT_REPLY_TEXT_FILTER.check_update(update)
         update.message.text = "test"
         update.message.reply_to_message.text = "text"
-        assert not (filters.TEXT & ~ReplyToMessageFilter(filters.TEXT)).check_update(update)
+        assert not TEXT_NOT_REPLY_TEXT_FILTER.check_update(update)
         update.message.text = None
         update.message.reply_to_message.text = None
-        assert not (filters.TEXT & ~ReplyToMessageFilter(filters.TEXT)).check_update(update)
+        assert not TEXT_NOT_REPLY_TEXT_FILTER.check_update(update)
         update.message.text = "test"
-        assert (filters.TEXT & ~ReplyToMessageFilter(filters.TEXT)).check_update(update)
+        assert TEXT_NOT_REPLY_TEXT_FILTER.check_update(update)
 
     def test_update_filter(self, update):
         assert not ReplyToMessageFilter(filters.UpdateType.CHANNEL_POST).check_update(update)
@@ -80,20 +99,19 @@ class TestReplyToMessageFilter:
         assert ReplyToMessageFilter(filters.UpdateType.CHANNEL_POST).check_update(update)
 
     def test_regex_filter(self, update):
-        regex_filter = filters.Regex(r"(\d+)")
-        assert not ReplyToMessageFilter(regex_filter).check_update(update)
+        assert not REPLY_REGEX_FILTER.check_update(update)
         update.message.reply_to_message.text = "foo 123, bar"
-        result = ReplyToMessageFilter(regex_filter).check_update(update)
+        result = REPLY_REGEX_FILTER.check_update(update)
         assert isinstance(result, dict)
 
-        result = ReplyToMessageFilter(filters.TEXT & regex_filter).check_update(update)
+        result = ReplyToMessageFilter(filters.TEXT & REGEX_FILTER).check_update(update)
         assert isinstance(result, dict)
-        assert (filters.TEXT & ReplyToMessageFilter(regex_filter)).check_update(update) is False
+        assert (filters.TEXT & REPLY_REGEX_FILTER).check_update(update) is False
         update.message.text = "test"
-        result = (filters.TEXT & ReplyToMessageFilter(regex_filter)).check_update(update)
+        result = (filters.TEXT & REPLY_REGEX_FILTER).check_update(update)
         assert isinstance(result, dict)
 
         update.message.text = "foo 456, bar"
-        result = (regex_filter & ReplyToMessageFilter(regex_filter)).check_update(update)
+        result = (REGEX_FILTER & REPLY_REGEX_FILTER).check_update(update)
         assert isinstance(result, dict)
         assert len(result["matches"]) == 2
@@ -17,9 +17,7 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 import datetime as dtm
-import os
 import pickle
-import sys
 from copy import deepcopy
 from typing import Optional
 
@@ -29,14 +27,14 @@ from telegram.ext import CallbackContext, MessageHandler, PicklePersistence, fil
 
 from ptbcontrib.roles import BOT_DATA_KEY, Role, Roles, RolesBotData, RolesHandler, setup_roles
 
+MESSAGE_DATE = dtm.datetime(2024, 1, 1, tzinfo=dtm.timezone.utc)
+
 
 @pytest.fixture(scope="function")
 def update():
     update = Update(
         0,
-        Message(
-            0, dtm.datetime.utcnow(), Chat(0, "private"), from_user=User(0, "TestUser", False)
-        ),
+        Message(0, MESSAGE_DATE, Chat(0, "private"), from_user=User(0, "TestUser", False)),
     )
     update._unfreeze()
     update.message._unfreeze()
@@ -60,15 +58,24 @@ def role():
     return Role(name="role")
 
 
-@pytest.fixture(autouse=True)
-def change_directory(tmp_path):
-    orig_dir = os.getcwd()
-    # Switch to a temporary directory so we don't have to worry about cleaning up files
-    # (str() for py<3.6)
-    os.chdir(str(tmp_path))
+@pytest.fixture(scope="function", autouse=True)
+def reset_default_admin():
+    # Every role registers itself as child of the default admin and Role.filter walks all of
+    # its children. Restore the admin after each test so that the roles don't pile up.
+    admin = Role._admin
+    chat_ids = set(admin.chat_ids) if admin is not None else set()
+    child_roles = set(admin.child_roles) if admin is not None else set()
     yield
-    # Go back to original directory
-    os.chdir(orig_dir)
+    if Role._admin is not None:
+        Role._admin._chat_ids = chat_ids
+        Role._admin._child_roles = child_roles
+
+
+@pytest.fixture(scope="function")
+def admin_member(role):
+    role._admin.add_member(0)
+    yield 0
+    role._admin.kick_member(0)
 
 
 class TestRole:
@@ -206,11 +213,34 @@ class TestRole:
 
         assert role is not copied_role
         assert role.equals(copied_role)
+        assert role.name == copied_role.name
         assert role.chat_ids is not copied_role.chat_ids
         assert role.chat_ids == copied_role.chat_ids
         (copied_child,) = copied_role.child_roles
         assert child is not copied_child
         assert child.equals(copied_child)
+        assert child.name == copied_child.name
+
+    def test_deepcopy_unpickled(self, role):
+        role.add_member(7)
+        unpickled_role = pickle.loads(pickle.dumps(role))
+        assert unpickled_role.name == role.name
+
+        copied_role = deepcopy(unpickled_role)
+        assert copied_role.equals(role)
+        assert copied_role.name == role.name
+
+    def test_deepcopy_subclass(self):
+        class CustomRole(Role):
+            pass
+
+        role = CustomRole(name="custom_role", chat_ids=[1])
+        role.custom_attribute = 42
+        copied_role = deepcopy(role)
+
+        assert type(copied_role) is CustomRole
+        assert copied_role.custom_attribute == 42
+        assert copied_role.equals(role)
 
     def test_filter_user(self, update, role, parent_role):
         update.message.chat = None
@@ -249,30 +279,25 @@ class TestRole:
         assert not (role & r).check_update(update)
         assert (role | r).check_update(update)
 
-    def test_filter_allow_parent(self, update, role, parent_role):
+    @pytest.mark.parametrize(["user_id", "chat_id", "expected"], [(0, 0, False), (1, 1, True)])
+    def test_filter_allow_parent(self, update, role, parent_role, user_id, chat_id, expected):
         role.add_member(0)
         parent_role.add_member(1)
         parent_role.add_child_role(role)
 
-        test_role = ~role
-        assert not test_role.check_update(update)
-        update.message.from_user.id = 1
-        update.message.chat.id = 1
-        assert test_role.check_update(update)
+        update.message.from_user.id = user_id
+        update.message.chat.id = chat_id
+        assert (~role).check_update(update) is expected
 
-    def test_filter_exclude_children(self, update, role, parent_role):
+    @pytest.mark.parametrize(["user_id", "chat_id"], [(0, 0), (1, 1), (2, 1)])
+    def test_filter_exclude_children(self, update, role, parent_role, user_id, chat_id):
         parent_role.add_child_role(role)
         parent_role.add_member(0)
         role.add_member(1)
 
-        test_role = ~parent_role
-        assert not test_role.check_update(update)
-        update.message.from_user.id = 1
-        update.message.chat.id = 1
-        assert not test_role.check_update(update)
-        update.message.from_user.id = 2
-        update.message.chat.id = 1
-        assert not test_role.check_update(update)
+        update.message.from_user.id = user_id
+        update.message.chat.id = chat_id
+        assert not (~parent_role).check_update(update)
 
     def test_filter_without_user_and_chat(self, update, role):
         role.add_member(0)
@@ -280,18 +305,22 @@ class TestRole:
         assert not role.check_update(update)
         assert not (~role).check_update(update)
 
-    def test_always_allow_admin(self, update, role):
-        role._admin.add_member(0)
-        try:
-            assert (~Role(0)).check_update(update)
-            assert (Role(0) & ~Role(0)).check_update(update)
-            assert (Role(1) & ~Role(0)).check_update(update)
-            assert (Role(1) & ~Role(2)).check_update(update)
-            assert (Role(0) | ~Role(0)).check_update(update)
-            assert (Role(1) | ~Role(0)).check_update(update)
-            assert (Role(1) | ~Role(2)).check_update(update)
-        finally:
-            role._admin.kick_member(0)
+    # The roles are built inside the test, as creating a Role registers it with the default admin
+    @pytest.mark.parametrize(
+        "make_filter",
+        [
+            lambda: ~Role(0),
+            lambda: Role(0) & ~Role(0),
+            lambda: Role(1) & ~Role(0),
+            lambda: Role(1) & ~Role(2),
+            lambda: Role(0) | ~Role(0),
+            lambda: Role(1) | ~Role(0),
+            lambda: Role(1) | ~Role(2),
+        ],
+        ids=["~0", "0&~0", "1&~0", "1&~2", "0|~0", "1|~0", "1|~2"],
+    )
+    def test_always_allow_admin(self, update, role, admin_member, make_filter):
+        assert make_filter().check_update(update)
 
     def test_non_message_update(self, update, role):
         update.message = None
@@ -322,10 +351,7 @@ class TestRole:
             "parent": parent_role,
             "child": child_role,
         }
-        with open("pickle", "wb") as file:
-            pickle.dump(data, file)
-        with open("pickle", "rb") as file:
-            data = pickle.load(file)
+        data = pickle.loads(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
 
         assert data["role"].equals(role)
         assert data["parent"].equals(parent_role)
@@ -370,7 +396,6 @@ class TestRoles:
         roles.kick_admin(2)
         assert roles.admins.chat_ids == set()
 
-    @pytest.mark.skipif(sys.version_info < (3, 6), reason="dicts are not ordered in py<=3.5")
     def test_dict_functionality(self, roles):
         roles.add_role("role0", 0)
         roles.add_role("role1", 1)
@@ -379,13 +404,13 @@ class TestRoles:
         assert "role2" in roles
         assert "role3" not in roles
 
-        a = {name for name in roles}
+        a = set(roles)
         assert a == {f"role{k}" for k in range(3)}
 
         b = {name: role.chat_ids for name, role in roles.items()}
         assert b == {f"role{k}": {k} for k in range(3)}
 
-        c = [name for name in roles.keys()]
+        c = list(roles.keys())
         assert c == [f"role{k}" for k in range(3)]
 
         d = [r.chat_ids for r in roles.values()]
@@ -431,8 +456,8 @@ class TestRoles:
         assert not test_role.check_update(update)
 
     @pytest.mark.filterwarnings("ignore:BasePersistence")
-    async def test_pickle(self, roles, bot):
-        persistence = PicklePersistence(filepath="pickle", on_flush=False)
+    async def test_pickle(self, roles, bot, tmp_path):
+        persistence = PicklePersistence(filepath=tmp_path / "pickle", on_flush=False)
         persistence.set_bot(bot)
 
         roles.add_role("role", [1, 2, 3])
@@ -444,7 +469,7 @@ class TestRoles:
         roles.admins.add_member(10)
 
         await persistence.update_bot_data(roles)
-        persistence = PicklePersistence(filepath="pickle", on_flush=False)
+        persistence = PicklePersistence(filepath=tmp_path / "pickle", on_flush=False)
         copied_roles = await persistence.get_bot_data()
 
         assert copied_roles["role"].equals(roles["role"])
@@ -464,12 +489,6 @@ class TestRoles:
         assert not copied_roles["role"] <= copied_roles["parent"]
 
 
-@pytest.fixture(scope="function", autouse=True)
-def clear_bot_data(app):
-    yield
-    app.bot_data = dict()
-
-
 class RolesData(RolesBotData):
     def __init__(self):
         self.roles = None
@@ -481,24 +500,29 @@ class RolesData(RolesBotData):
         self.roles = roles
 
 
+@pytest.fixture(scope="function", params=[True, False], ids=["RolesBotData", "dict"])
+def roles_app(request, app):
+    if request.param:
+        app.bot_data = RolesData()
+    return app
+
+
 class TestRolesHandler:
-    @pytest.mark.parametrize("roles_bot_data", [True, False])
-    def test_setup_roles(self, app, roles_bot_data):
-        if roles_bot_data:
-            app.bot_data = RolesData()
-        roles = setup_roles(app)
+    def test_setup_roles(self, roles_app):
+        roles_bot_data = isinstance(roles_app.bot_data, RolesData)
+        roles = setup_roles(roles_app)
         assert isinstance(roles, Roles)
         if not roles_bot_data:
-            assert app.bot_data[BOT_DATA_KEY] is roles
+            assert roles_app.bot_data[BOT_DATA_KEY] is roles
         else:
-            assert app.bot_data.get_roles() is roles
+            assert roles_app.bot_data.get_roles() is roles
         # We test twice to make sure everything nothing goes wrong when roles is already there
-        roles = setup_roles(app)
+        roles = setup_roles(roles_app)
         assert isinstance(roles, Roles)
         if not roles_bot_data:
-            assert app.bot_data[BOT_DATA_KEY] is roles
+            assert roles_app.bot_data[BOT_DATA_KEY] is roles
         else:
-            assert app.bot_data.get_roles() is roles
+            assert roles_app.bot_data.get_roles() is roles
 
     def test_setup_roles_invalid_bot_data_type(self, app):
         app.bot_data = 17
@@ -517,11 +541,8 @@ class TestRolesHandler:
         with pytest.raises(TypeError, match="dict or implement RolesBotData"):
             roles_handler.collect_additional_context(context, app, update, True)
 
-    @pytest.mark.parametrize("roles_bot_data", [True, False])
-    async def test_callback_and_context(self, app, update, roles_bot_data):
-        if roles_bot_data:
-            app.bot_data = RolesData()
-        self.roles = setup_roles(app)
+    async def test_callback_and_context(self, roles_app, update):
+        self.roles = setup_roles(roles_app)
         self.roles.admins.add_member(42)
         self.roles.add_role(name="role", chat_ids=[1])
         self.test_flag = False
@@ -538,16 +559,13 @@ class TestRolesHandler:
         update.message.from_user.id = 42
         assert roles_handler.check_update(update)
 
-        app.add_handler(roles_handler)
-        async with app:
-            await app.process_update(update)
+        roles_app.add_handler(roles_handler)
+        async with roles_app:
+            await roles_app.process_update(update)
         assert self.test_flag
 
-    @pytest.mark.parametrize("roles_bot_data", [True, False])
-    async def test_callback_and_context_no_roles(self, app, update, roles_bot_data):
-        if roles_bot_data:
-            app.bot_data = RolesData()
-        self.roles = setup_roles(app)
+    async def test_callback_and_context_no_roles(self, roles_app, update):
+        self.roles = setup_roles(roles_app)
         self.roles.admins.add_member(42)
         self.roles.add_role(name="role", chat_ids=[1])
         self.test_flag = False
@@ -564,25 +582,22 @@ class TestRolesHandler:
         update.message.from_user.id = 42
         assert roles_handler.check_update(update)
 
-        app.add_handler(roles_handler)
-        async with app:
-            await app.process_update(update)
+        roles_app.add_handler(roles_handler)
+        async with roles_app:
+            await roles_app.process_update(update)
         assert self.test_flag
 
-    @pytest.mark.parametrize("roles_bot_data", [True, False])
-    async def test_handler_error_message(self, app, update, roles_bot_data):
-        if roles_bot_data:
-            app.bot_data = RolesData()
+    async def test_handler_error_message(self, roles_app, update):
         handler = MessageHandler(filters.ALL, callback=lambda u, c: 1)
         roles_handler = RolesHandler(handler, roles=Role(0))
-        app.add_handler(roles_handler)
+        roles_app.add_handler(roles_handler)
         self.test_flag = False
 
         async def error_handler(_, context: CallbackContext):
             self.test_flag = "You must set a Roles instance" in str(context.error)
 
-        app.add_error_handler(error_handler)
-        async with app:
-            await app.process_update(update)
+        roles_app.add_error_handler(error_handler)
+        async with roles_app:
+            await roles_app.process_update(update)
 
         assert self.test_flag
@@ -18,16 +18,61 @@
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 import inspect
 import random
+from typing import Dict
 
 import pytest
 from telegram.error import TelegramError
 
 from ptbcontrib.send_by_kwargs import send_by_kwargs
 from ptbcontrib.send_by_kwargs.send_by_kwargs import _CACHED_SIGNATURES, _UNIQUE_KWARGS
+from tests.conftest import DictExtBot
 
+# Use a local RNG with a fixed seed, so that every collection yields the same order and the
+# global random state is left alone
 temp = list(_UNIQUE_KWARGS.items())
-random.shuffle(temp)
-UNIQUE_KWARGS_SHUFFLED = {key: value for key, value in temp}
+random.Random(0).shuffle(temp)
+UNIQUE_KWARGS_ITEMS = tuple(temp)
+METHODS = tuple(method for method, _ in temp)
+# The bot fixture is a DictExtBot. Its bound methods, which get_signature inspects, have the same
+# parameters as the functions on the class apart from self
+PARSE_MODE_METHODS = tuple(
+    method
+    for method in METHODS
+    if "parse_mode" in inspect.signature(getattr(DictExtBot, method)).parameters
+)
+
+# The bot fixture is session scoped, so the signatures can be computed once per method
+SIGNATURES: Dict[str, inspect.Signature] = {}
+
+
+def get_signature(bot, method):
+    if method not in SIGNATURES:
+        SIGNATURES[method] = inspect.signature(getattr(bot, method))
+    return SIGNATURES[method]
+
+
+# special casing for some methods where the required arguments are not clear due to the fact that
+# we made them optional in order to allow passing e.g. a Venue directly
+OPTIONAL_REQUIRED_KWARGS = frozenset(
+    {"latitude", "longitude", "address", "phone_number", "first_name"}
+)
+REQUIRED_KWARGS: Dict[str, Dict[str, bool]] = {}
+
+
+def get_required_kwargs(bot, method):
+    if method not in REQUIRED_KWARGS:
+        REQUIRED_KWARGS[method] = {
+            name: True
+            for name, param in get_signature(bot, method).parameters.items()
+            if param.default == inspect.Parameter.empty or name in OPTIONAL_REQUIRED_KWARGS
+        }
+    return REQUIRED_KWARGS[method].copy()
+
+
+def patch_method(monkeypatch, bot, method, mock):
+    # we're a bit tricky here, because otherwise monkeypatch would fiddle with the signature
+    monkeypatch.setitem(_CACHED_SIGNATURES, mock.__name__, get_signature(bot, method))
+    monkeypatch.setattr(bot, method, mock)
 
 
 class TestSendByKwargs:
@@ -39,8 +84,8 @@ class TestSendByKwargs:
 
     @pytest.mark.parametrize(
         argnames="method,args",
-        argvalues=list(UNIQUE_KWARGS_SHUFFLED.items()),
-        ids=list(UNIQUE_KWARGS_SHUFFLED),
+        argvalues=UNIQUE_KWARGS_ITEMS,
+        ids=METHODS,
     )
     async def test_correct_selection(self, method, args, bot):
         if method == "send_dice":
@@ -66,7 +111,7 @@ class TestSendByKwargs:
 
     @pytest.mark.parametrize(
         argnames="method",
-        argvalues=list(UNIQUE_KWARGS_SHUFFLED),
+        argvalues=METHODS,
     )
     async def test_kwargs_passing(self, method, bot, monkeypatch):
         """
@@ -74,7 +119,7 @@ class TestSendByKwargs:
         accepted by the selected method.
         """
 
-        signature = inspect.signature(getattr(bot, method))
+        signature = get_signature(bot, method)
         expected_kwargs = {name: True for name, param in signature.parameters.items()}
         kwargs = expected_kwargs.copy()
         kwargs["dummy"] = "this_should_not_be_passed"
@@ -82,10 +127,7 @@ class TestSendByKwargs:
         async def make_assertion(**_kwargs):
             self.test_flag = _kwargs == expected_kwargs
 
-        # we're a bit tricky here, because otherwise monkeypatch would fiddle with the signature
-        _CACHED_SIGNATURES["make_assertion"] = signature
-
-        monkeypatch.setattr(bot, method, make_assertion)
+        patch_method(monkeypatch, bot, method, make_assertion)
         await send_by_kwargs(bot, kwargs)
         assert self.test_flag
 
@@ -95,7 +137,7 @@ class TestSendByKwargs:
 
     @pytest.mark.parametrize(
         argnames="method",
-        argvalues=list(UNIQUE_KWARGS_SHUFFLED),
+        argvalues=PARSE_MODE_METHODS,
     )
     @pytest.mark.parametrize(
         argnames="parse_mode",
@@ -111,26 +153,11 @@ class TestSendByKwargs:
             else:
                 self.test_flag = kwargs.get("parse_mode", None) == "HTML"
 
-        signature = inspect.signature(getattr(bot, method))
-        if "parse_mode" not in signature.parameters.keys():
-            return
-
-        kwargs = {
-            name: True
-            for name, param in signature.parameters.items()
-            if param.default == inspect.Parameter.empty
-            # special casing for some methods where the required arguments are not clear
-            # due to the fact that we made them optional in order to allow passing e.g. a Venue
-            # directly
-            or name in ["latitude", "longitude", "address", "phone_number", "first_name"]
-        }
+        kwargs = get_required_kwargs(bot, method)
         if parse_mode is not None:
             kwargs["parse_mode"] = "HTML"
 
-        # we're a bit tricky here, because otherwise monkeypatch would fiddle with the signature
-        _CACHED_SIGNATURES["make_assertion"] = signature
-
-        monkeypatch.setattr(bot, method, make_assertion)
+        patch_method(monkeypatch, bot, method, make_assertion)
         await send_by_kwargs(bot, kwargs)
         assert self.test_flag
 
@@ -142,9 +169,7 @@ class TestSendByKwargs:
         async def make_assertion(**kwargs):
             self.test_flag = True
 
-        signature = inspect.signature(bot.send_dice)
-        _CACHED_SIGNATURES["make_assertion"] = signature
-        monkeypatch.setattr(bot, "send_dice", make_assertion)
+        patch_method(monkeypatch, bot, "send_dice", make_assertion)
         await send_by_kwargs(bot, {"chat_id": 1})
         assert self.test_flag
 
@@ -169,9 +194,7 @@ class TestSendByKwargs:
         async def make_assertion(**kw):
             self.test_flag = kw == expected_kwargs
 
-        signature = inspect.signature(bot.send_message)
-        _CACHED_SIGNATURES["make_assertion"] = signature
-        monkeypatch.setattr(bot, "send_message", make_assertion)
+        patch_method(monkeypatch, bot, "send_message", make_assertion)
         await send_by_kwargs(bot, kwargs, **_kwargs)
         assert self.test_flag
 
@@ -179,8 +202,6 @@ class TestSendByKwargs:
         async def mock(**_kw):
             raise TelegramError("Error")
 
-        signature = inspect.signature(bot.send_message)
-        _CACHED_SIGNATURES["mock"] = signature
-        monkeypatch.setattr(bot, "send_message", mock)
+        patch_method(monkeypatch, bot, "send_message", mock)
         with pytest.raises(RuntimeError, match="Selected method 'mock', but it raised"):
             await send_by_kwargs(bot, chat_id=123, text="Hi")